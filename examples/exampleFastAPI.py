@@ -1,44 +1,178 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import asyncio
+import concurrent.futures
+import contextlib
+import functools
+import os
 import pathlib
+import queue
+from typing import List
 
+import numpy as np
 import pytessy.pytessy as pytessy
-from fastapi import FastAPI
+from fastapi import FastAPI, Query
 from PIL import Image, ImageFilter
 
-app = FastAPI()
+# One OpenMP thread per Tesseract-OCR instance, the pool provides parallelism
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+OCR_CONCURRENCY = int(os.getenv("OCR_CONCURRENCY", os.cpu_count() or 1))
+# Images waiting between two pipeline stages of a request
+PIPELINE_DEPTH = 4
+TARGET_DPI = 300
+# Images without DPI information are assumed to be screen images
+DEFAULT_DPI = pytessy.PyTessy.DEFAULT_HORIZONTAL_DPI
 
+root_dir = pathlib.Path(__file__).parents[1]
+image_folder = pathlib.Path(root_dir, "tests")
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    # Create pytessy instances once, Tesseract-OCR initialization is expensive.
+    # TessBaseAPI is not reentrant, so every worker thread gets its own.
+    app.state.ocr_pool = queue.Queue()
+    for _ in range(OCR_CONCURRENCY):
+        app.state.ocr_pool.put(
+            pytessy.PyTessy(
+                # tesseract_path="/usr/bin/tesseract",
+                # lib_path="/usr/bin/tesseract",
+                # data_path="/usr/share/tesseract-ocr/4.00/tessdata",
+            )
+        )
+    # Never wait for more instances than the pool holds
+    app.state.ocr_semaphore = asyncio.Semaphore(OCR_CONCURRENCY)
+    # Separate executors so that disk reads, preprocessing and OCR overlap
+    app.state.io_executor = concurrent.futures.ThreadPoolExecutor(4)
+    app.state.cpu_executor = concurrent.futures.ThreadPoolExecutor(os.cpu_count())
+    app.state.ocr_executor = concurrent.futures.ThreadPoolExecutor(OCR_CONCURRENCY)
+    yield
+    for executor in (
+        app.state.io_executor,
+        app.state.cpu_executor,
+        app.state.ocr_executor,
+    ):
+        executor.shutdown()
+    del app.state.ocr_pool
 
-@app.get("/")
-async def root():
-    # Create pytessy instance
-    ocrReader = pytessy.PyTessy(
-        # tesseract_path="/usr/bin/tesseract",
-        # lib_path="/usr/bin/tesseract",
-        # data_path="/usr/share/tesseract-ocr/4.00/tessdata",
-    )
 
-    root_dir = pathlib.Path(__file__).parents[1]
-    image_folder = pathlib.Path(root_dir, "tests")
+app = FastAPI(lifespan=lifespan)
 
-    file = image_folder / "testWord.png"
 
+def load(file):
     # Load Image
     img = Image.open(file)
+    if img.format == "JPEG":
+        # Let libjpeg decode straight to grayscale
+        img.draft("L", img.size)
+    img.load()
+    return img
+
+
+def to_array(img):
+    # Converts an L image to a numpy array with a single raw encoder call.
+    # np.asarray() goes through Image.tobytes(), which encodes in 64 kB
+    # chunks and joins them afterwards; about 10 times slower on large pages.
+    img.load()
+    encoder = Image._getencoder(img.mode, "raw", img.mode)
+    encoder.setimage(img.im, (0, 0) + img.size)
+    _, errcode, data = encoder.encode(img.width * img.height)
+    if errcode != 1:  # not finished in one call, let Pillow handle it
+        return np.asarray(img)
+    return np.frombuffer(data, dtype=np.uint8).reshape(img.height, img.width)
+
+
+def prepare(img):
+    # OCR needs one channel only, later steps process 3-4 times less data
+    img = img.convert("L")
+
+    # Scale up and sharpen low resolution images only
+    dpi = img.info.get("dpi", (DEFAULT_DPI, DEFAULT_DPI))[0]
+    if dpi <= 0:  # malformed JFIF/pHYs header
+        dpi = DEFAULT_DPI
+    scale_factor = 1
+    if dpi < 200:
+        scale_factor = TARGET_DPI / dpi
+        img = img.resize(
+            (round(img.width * scale_factor), round(img.height * scale_factor)),
+            Image.BILINEAR,
+        )
+        img = img.filter(ImageFilter.SHARPEN)
+    # Convert to a numpy array, tell Tesseract-OCR the resulting resolution
+    return to_array(img), round(dpi * scale_factor)
+
+
+async def read(arr, resolution):
+    loop = asyncio.get_running_loop()
+    async with app.state.ocr_semaphore:
+        ocrReader = app.state.ocr_pool.get_nowait()
+        try:
+            text = await loop.run_in_executor(
+                app.state.ocr_executor,
+                functools.partial(
+                    ocrReader.readnp,
+                    arr,
+                    resolution=resolution,
+                    raw=True,
+                    psm=None,
+                ),
+            )
+        finally:
+            app.state.ocr_pool.put(ocrReader)
+    return text.decode("utf-8")
+
+
+@app.get("/")
+async def root(files: List[str] = Query(["testWord.png"])):
+    # Only files from the image folder are served
+    paths = [image_folder / pathlib.Path(name).name for name in files]
+    results = [None] * len(paths)
+    loop = asyncio.get_running_loop()
+    load_q = asyncio.Queue(PIPELINE_DEPTH)
+    prep_q = asyncio.Queue(PIPELINE_DEPTH)
+
+    # Pipeline: load -> preprocess -> OCR, None marks the end of the images
+    async def load_stage():
+        for i, path in enumerate(paths):
+            img = await loop.run_in_executor(app.state.io_executor, load, path)
+            await load_q.put((i, img))
+        await load_q.put(None)
+
+    async def prepare_stage():
+        while True:
+            item = await load_q.get()
+            if item is None:
+                break
+            i, img = item
+            arr, resolution = await loop.run_in_executor(
+                app.state.cpu_executor, prepare, img
+            )
+            await prep_q.put((i, arr, resolution))
+        await prep_q.put(None)
+
+    async def ocr_stage():
+        async def ocr_one(i, arr, resolution):
+            imageStr = await read(arr, resolution)
+            print(paths[i], imageStr)
+            results[i] = {"File": paths[i], "ImageStr": imageStr}
+
+        tasks = []
+        while True:
+            item = await prep_q.get()
+            if item is None:
+                break
+            tasks.append(asyncio.ensure_future(ocr_one(*item)))
+        await asyncio.gather(*tasks)
 
-    # Scale up image
-    w, h = img.size
-    img = img.resize((2 * w, 2 * h))
-    # Sharpen image
-    img = img.filter(ImageFilter.SHARPEN)
-    # Convert to ctypes
-    imgBytes = img.tobytes()
-    bytesPerPixel = int(len(imgBytes) / (img.width * img.height))
-    # Use OCR on Image
-    imageStr = ocrReader.read(
-        img.tobytes(), img.width, img.height, bytesPerPixel, raw=True, resolution=600
-    ).decode("utf-8")
-    print(file, imageStr)
-
-    return {"File": file, "ImageStr": imageStr}
+    stages = [
+        asyncio.ensure_future(stage())
+        for stage in (load_stage, prepare_stage, ocr_stage)
+    ]
+    try:
+        await asyncio.gather(*stages)
+    finally:
+        # A failing stage must not leave the others waiting on their queues
+        for stage in stages:
+            stage.cancel()
+    return results
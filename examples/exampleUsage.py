@@ -1,12 +1,63 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import concurrent.futures
 import pathlib
 
-import cv2
+import numpy as np
 import pytessy.pytessy as pytessy
 from PIL import Image, ImageFilter
 
+TARGET_DPI = 300
+# Images without DPI information are assumed to be screen images
+DEFAULT_DPI = pytessy.PyTessy.DEFAULT_HORIZONTAL_DPI
+
+
+def load_image(path):
+    """Opens and decodes an image file"""
+    img = Image.open(path)
+    if img.format == "JPEG":
+        # Let libjpeg decode straight to grayscale
+        img.draft("L", img.size)
+    # OCR needs one channel only, later steps process 3-4 times less data
+    return img.convert("L")
+
+
+def preprocess(img):
+    """
+    Scales up low resolution images to TARGET_DPI and sharpens them,
+    returns the image and its resolution after scaling
+    """
+    dpi = img.info.get("dpi", (DEFAULT_DPI, DEFAULT_DPI))[0]
+    if dpi <= 0:  # malformed JFIF/pHYs header
+        dpi = DEFAULT_DPI
+    scale_factor = 1
+    # Native resolution scans do not benefit from resizing or sharpening
+    if dpi < 200:
+        scale_factor = TARGET_DPI / dpi
+        img = img.resize(
+            (round(img.width * scale_factor), round(img.height * scale_factor)),
+            Image.BILINEAR,
+        )
+        img = img.filter(ImageFilter.SHARPEN)
+    return img, round(dpi * scale_factor)
+
+
+def to_array(img):
+    """
+    Converts an L image to a numpy array with a single raw encoder call.
+    np.asarray() goes through Image.tobytes(), which encodes in 64 kB
+    chunks and joins them afterwards; about 10 times slower on large pages.
+    """
+    img.load()
+    encoder = Image._getencoder(img.mode, "raw", img.mode)
+    encoder.setimage(img.im, (0, 0) + img.size)
+    _, errcode, data = encoder.encode(img.width * img.height)
+    if errcode != 1:  # not finished in one call, let Pillow handle it
+        return np.asarray(img)
+    return np.frombuffer(data, dtype=np.uint8).reshape(img.height, img.width)
+
+
 if __name__ == "__main__":
 
     # Create pytessy instance
@@ -16,40 +67,44 @@ if __name__ == "__main__":
     root_dir = pathlib.Path(__file__).parents[1]
 
     # PIL Example
-    for file in files:
-        # Load Image
-        img = Image.open(pathlib.Path(root_dir, file))
-        # Scale up image
-        w, h = img.size
-        img = img.resize((2 * w, 2 * h))
-        # Sharpen image
-        img = img.filter(ImageFilter.SHARPEN)
-        # Convert to ctypes
-        imgBytes = img.tobytes()
-        bytesPerPixel = int(len(imgBytes) / (img.width * img.height))
-        # Use OCR on Image
-        imageStr = ocrReader.read(
-            img.tobytes(),
-            img.width,
-            img.height,
-            bytesPerPixel,
-            raw=True,
-            resolution=600,
+    # Load all images first (I/O bound, in parallel), then feed them to the
+    # same ocrReader back-to-back. For large batches of files the tesseract
+    # executable can do the same on its own with a list file:
+    #   tesseract img_list.txt out
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        images = list(
+            executor.map(load_image, (pathlib.Path(root_dir, f) for f in files))
         )
+    for file, img in zip(files, images):
+        # Scale up and sharpen image
+        img, resolution = preprocess(img)
+        # Convert to a numpy array
+        arr = to_array(img)
+        # Use OCR on Image
+        imageStr = ocrReader.readnp(arr, resolution=resolution, raw=True, psm=None)
 
         print(file, imageStr.decode("utf-8"))
 
+    # OpenCV is only needed by the examples below, it loads many shared libraries
+    import cv2
+
     # OpenCV  example #1
     file = str(pathlib.Path(root_dir, files[0]))
     img = cv2.imread(file)
     img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    bytesPerPixel = int(len(img.tobytes()) / (img.shape[1] * img.shape[0]))
-    imageStr = ocrReader.read(img.tobytes(), img.shape[1], img.shape[0], bytesPerPixel)
+    # Scale up image, linear interpolation is good enough for OCR
+    h, w = img.shape
+    img = cv2.resize(img, (2 * w, 2 * h), interpolation=cv2.INTER_LINEAR)
+    bytesPerPixel = 1 if img.ndim == 2 else img.shape[2]
+    imageStr = ocrReader.read(img, img.shape[1], img.shape[0], bytesPerPixel)
     print(file, imageStr)
 
     # OpenCV  example #2
     file = str(pathlib.Path(root_dir, files[1]))
     img = cv2.imread(file)
     img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    # Scale up image, linear interpolation is good enough for OCR
+    h, w = img.shape
+    img = cv2.resize(img, (2 * w, 2 * h), interpolation=cv2.INTER_LINEAR)
     imageStr = ocrReader.readnp(img)
     print(file, imageStr)
@@ -28,6 +28,7 @@ setup(
     extras_require={
         "dev": ["flake8", "pytest"],
         "test": ["coverage", "Pillow"],
+        "simd": ["pillow-simd"],
     },
     test_suite='tests',
     classifiers=[
@@ -29,12 +29,18 @@ Distributed under the Boost Software License, Version 1.0.
 See accompanying file LICENSE or a copy at https://www.boost.org/LICENSE_1_0.txt
 """
 
+# pylint: disable=too-many-lines
+
+from concurrent.futures import ThreadPoolExecutor
 import ctypes
 import ctypes.util
-from distutils.spawn import find_executable
-from os import environ
+import functools
+from os import cpu_count, environ
 import pathlib
+import shutil
 from sys import platform
+import threading
+import weakref
 
 try:
     import numpy as np
@@ -43,6 +49,26 @@ except ImportError:
     NO_NUMPY = True
 
 
+@functools.lru_cache(maxsize=256)
+def _ascii(text):
+    """
+    Encodes string to ASCII bytes
+    -----------------------------
+    Results are cached since the same parameter names and values are passed
+    to Tesseract-OCR over and over again.
+    @Params: text   (string)    String to encode.
+    @Return: (bytes)            ASCII encoded string.
+    """
+
+    return text.encode("ascii")
+
+
+# Tesseract-OCR handlers shared by PyTessy instances created with
+# shared_handler=True, keyed by (lib_path, data_path, language)
+_HANDLER_CACHE = weakref.WeakValueDictionary()
+_HANDLER_CACHE_LOCK = threading.Lock()
+
+
 class PyTessyError(Exception):
     """
     PyTessyError class
@@ -60,8 +86,19 @@ class TesseractHandler:
     Handles raw Tesseract-OCR calls with limited functionality only.
     """
 
+    # pylint: disable=not-callable
+
     _lib = None
     _api = None
+    # Library functions used on every read, bound once by setup_lib()
+    _fn_get_text = None
+    _fn_delete_text = None
+    _fn_set_image = None
+    _fn_set_resolution = None
+    _fn_set_psm = None
+    _fn_get_psm = None
+    _fn_set_variable = None
+    _fn_mean_text_conf = None
 
     class TessBaseAPI(ctypes._Pointer):  # pylint: disable=protected-access
         """
@@ -82,12 +119,32 @@ class TesseractHandler:
         """
 
         self.closed = False
-        if self._lib is None:
-            self.setup_lib(lib_path)
+        # Last known Page Segmentation Mode, None if unknown
+        self._cur_psm = None
+        _ensure_lib(lib_path)
         self._api = self._lib.TessBaseAPICreate()
+        # Library and api stay set from here on, methods do not check them again
+        self._check_setup()
+        self.reinit(data_path, language)
+
+    def reinit(self, data_path, language):
+        """
+        (Re)initializes Tesseract-OCR api with data path and language
+        -------------------------------------------------------------
+        The api handle is kept, so changing language does not need a new
+        handler. Tesseract-OCR may reset variables set before.
+        @Params: data_path  (string)    Path to Tesseract-OCR data files.
+                 language   (string)    Language code to work with.
+        @Raises: PyTessyError           If Tesseract-OCR fails to load the
+                                        language data.
+        """
+
+        self._cur_psm = None
         if self._lib.TessBaseAPIInit3(
-            self._api, str(data_path).encode("ascii"), language.encode("ascii")
+            self._api, _ascii(str(data_path)), _ascii(language)
         ):
+            # Leftovers of the failed init would break the next one
+            self._lib.TessBaseAPIEnd(self._api)
             raise PyTessyError("Failed to initialize Tesseract-OCR library.")
 
     def tesseract_version(self):
@@ -104,13 +161,14 @@ class TesseractHandler:
         ---------------------------------
         @Return: (list)     List of all available languages for OCR
         """
-        self._check_setup()
         langs = self._lib.TessBaseAPIGetAvailableLanguagesAsVector(self._api)
         languages = []
         i = 0
+        # Raw addresses, strings are only created for the actual languages
         while langs[i]:
-            languages.append(langs[i].decode("utf-8"))
+            languages.append(ctypes.string_at(langs[i]).decode("utf-8"))
             i += 1
+        self._lib.TessDeleteTextArray(langs)
         return languages
 
     def get_text(self):
@@ -120,23 +178,26 @@ class TesseractHandler:
         @Return: (string)   Text read by Tesseract-OCR as utf-8 string.
         """
 
-        self._check_setup()
-        result = self._lib.TessBaseAPIGetUTF8Text(self._api)
-        if isinstance(result, bytes):
-            return result.decode("utf-8")
-        if isinstance(result, str):
-            return result
-        return ""
+        result = self.get_text_raw()
+        # result is either bytes or None (no image set)
+        return result.decode("utf-8") if result else ""
 
     def get_text_raw(self):
         """
         Gets text as raw bytes data
         ---------------------------
-        @Return: (bytes)    Text read by Tesseract-OCR as raw bytes.
+        @Return: (bytes)    Text read by Tesseract-OCR as raw bytes, None if
+                            no image is set.
         """
 
-        self._check_setup()
-        return self._lib.TessBaseAPIGetUTF8Text(self._api)
+        text_ptr = self._fn_get_text(self._api)
+        if not text_ptr:
+            return None
+        # The text is allocated by Tesseract-OCR, copy it and free the original
+        try:
+            return ctypes.string_at(text_ptr)
+        finally:
+            self._fn_delete_text(text_ptr)
 
     def set_image(
         self, imagedata, width, height, bytes_per_pixel, bytes_per_line, resolution
@@ -154,11 +215,10 @@ class TesseractHandler:
                                                         in dpi.
         """
 
-        self._check_setup()
-        self._lib.TessBaseAPISetImage(
+        self._fn_set_image(
             self._api, imagedata, width, height, bytes_per_pixel, bytes_per_line
         )
-        self._lib.TessBaseAPISetSourceResolution(self._api, resolution)
+        self._fn_set_resolution(self._api, resolution)
 
     def set_psm(self, psm):
         """
@@ -186,8 +246,10 @@ class TesseractHandler:
         https://github.com/UB-Mannheim/tesseract/blob/master/include/tesseract/capi.h
         """
 
-        self._check_setup()
-        self._lib.TessBaseAPISetPageSegMode(self._api, psm)
+        if psm is None or psm == self._cur_psm:
+            return
+        self._fn_set_psm(self._api, psm)
+        self._cur_psm = psm
 
     def get_psm(self):
         """
@@ -215,8 +277,9 @@ class TesseractHandler:
         https://github.com/UB-Mannheim/tesseract/blob/master/include/tesseract/capi.h
         """
 
-        self._check_setup()
-        return self._lib.TessBaseAPIGetPageSegMode(self._api)
+        if self._cur_psm is None:
+            self._cur_psm = self._fn_get_psm(self._api)
+        return self._cur_psm
 
     def set_variable(self, key, val):
         """
@@ -232,19 +295,17 @@ class TesseractHandler:
         @Return: (bool) ``False`` if the name lookup failed.
         """
 
-        self._check_setup()
         if not isinstance(val, str):
             val = str(val)
-        return self._lib.TessBaseAPISetVariable(
-            self._api, key.encode("ascii"), val.encode("ascii")
-        )
+        if key == "tessedit_pageseg_mode":
+            self._cur_psm = None
+        return self._fn_set_variable(self._api, _ascii(key), _ascii(val))
 
     def mean_text_conf(self):
         """
         @Return: (int) average confidence value between 0 and 100.
         """
-        self._check_setup()
-        return self._lib.TessBaseAPIMeanTextConf(self._api)
+        return self._fn_mean_text_conf(self._api)
 
     @classmethod
     def setup_lib(cls, lib_path=None):
@@ -263,15 +324,28 @@ class TesseractHandler:
         cls._lib = lib = ctypes.CDLL(lib_path)
 
         lib.TessBaseAPICreate.restype = cls.TessBaseAPI  # handle
+        lib.TessBaseAPICreate.argtypes = ()
 
         lib.TessBaseAPIDelete.restype = None  # void
         lib.TessBaseAPIDelete.argtypes = (cls.TessBaseAPI,)  # handle
 
-        lib.TessVersion.restype = ctypes.c_char_p
+        lib.TessBaseAPIEnd.restype = None  # void
+        lib.TessBaseAPIEnd.argtypes = (cls.TessBaseAPI,)  # handle
+
+        lib.TessVersion.restype = ctypes.c_char_p  # version
+        lib.TessVersion.argtypes = ()
+
         lib.TessBaseAPIGetAvailableLanguagesAsVector.restype = ctypes.POINTER(
-            ctypes.c_char_p
-        )
+            ctypes.c_void_p
+        )  # languages
+        lib.TessBaseAPIGetAvailableLanguagesAsVector.argtypes = (
+            cls.TessBaseAPI,
+        )  # handle
+
+        lib.TessDeleteTextArray.restype = None  # void
+        lib.TessDeleteTextArray.argtypes = (ctypes.POINTER(ctypes.c_void_p),)  # array
 
+        lib.TessBaseAPIInit3.restype = ctypes.c_int  # error code
         lib.TessBaseAPIInit3.argtypes = (
             cls.TessBaseAPI,  # handle
             ctypes.c_char_p,  # datapath
@@ -288,15 +362,13 @@ class TesseractHandler:
             ctypes.c_int,
         )  # bytes_per_line
 
-        lib.TessBaseAPISetVariable.argtypes = (
-            cls.TessBaseAPI,
-            ctypes.c_char_p,
-            ctypes.c_char_p,
-        )
-
-        lib.TessBaseAPIGetUTF8Text.restype = ctypes.c_char_p  # text
+        # Text is returned as address, so that it can be freed by TessDeleteText
+        lib.TessBaseAPIGetUTF8Text.restype = ctypes.c_void_p  # text
         lib.TessBaseAPIGetUTF8Text.argtypes = (cls.TessBaseAPI,)  # handle
 
+        lib.TessDeleteText.restype = None  # void
+        lib.TessDeleteText.argtypes = (ctypes.c_void_p,)  # text
+
         lib.TessBaseAPISetSourceResolution.restype = None  # void
         lib.TessBaseAPISetSourceResolution.argtypes = (
             cls.TessBaseAPI,  # handle
@@ -322,6 +394,16 @@ class TesseractHandler:
         lib.TessBaseAPIMeanTextConf.restype = ctypes.c_int  # int
         lib.TessBaseAPIMeanTextConf.argtypes = (cls.TessBaseAPI,)  # handle
 
+        # Resolve hot path functions once instead of on every call
+        cls._fn_get_text = lib.TessBaseAPIGetUTF8Text
+        cls._fn_delete_text = lib.TessDeleteText
+        cls._fn_set_image = lib.TessBaseAPISetImage
+        cls._fn_set_resolution = lib.TessBaseAPISetSourceResolution
+        cls._fn_set_psm = lib.TessBaseAPISetPageSegMode
+        cls._fn_get_psm = lib.TessBaseAPIGetPageSegMode
+        cls._fn_set_variable = lib.TessBaseAPISetVariable
+        cls._fn_mean_text_conf = lib.TessBaseAPIMeanTextConf
+
     def _check_setup(self):
         """
         Checks whether Tesseract-OCR is set up or not
@@ -348,6 +430,141 @@ class TesseractHandler:
             self.closed = True
 
 
+# Whether TesseractHandler.setup_lib() has bound the library already
+_LIB_READY = False
+
+
+def _ensure_lib(lib_path):
+    """
+    Binds Tesseract-OCR library to the handler once per process
+    ------------------------------------------------------------
+    @Params: lib_path   (string)    Path to Tesseract-OCR library.
+    @Raises: PyTessyError           If ctypes cannot find Tesseract-OCR
+                                    library.
+    """
+
+    global _LIB_READY  # pylint: disable=global-statement
+    if _LIB_READY:
+        return
+    TesseractHandler.setup_lib(lib_path)
+    _LIB_READY = True
+
+
+@functools.lru_cache(maxsize=8)
+def _locate_tesseract(
+    tesseract_path,
+    api_version,
+    run_path,
+    platform_key,
+    program_files,
+    *,
+    verbose_search,
+):
+    """
+    Searches for Tesseract-OCR library
+    ----------------------------------
+    Results are cached, so only the first PyTessy instance pays for the
+    search (file system checks) with the same arguments. Verbose searches
+    call the uncached _locate_tesseract.__wrapped__ to display the search.
+    @Params: tesseract_path (string)    Path (directory's name) to
+                                        Tesseract-OCR library or None.
+             api_version    (string)    Api version suffix string or None.
+             run_path       (string)    Directory to search in first.
+             platform_key   (string)    Value of sys.platform.
+             program_files  (tuple)     Values of the PROGRAMFILES and
+                                        PROGRAMFILES(X86) environment
+                                        variables (None if not set).
+             verbose_search (boolean)   Whether to display library searching
+                                        process or not.
+    @Return: (tuple)                    Library path and default data path
+                                        (None if there is no default).
+    @Raises: NotImplementedError        If the operating system is not
+                                        implemented yet (macOS).
+             NotImplementedError        If the operating system is
+                                        not supported.
+             FileNotFoundError          If failed to found library with
+                                        search process.
+    """
+
+    if verbose_search:
+        def verbose(*arg, **kwargs):
+            print(*arg, **kwargs)
+    else:
+        def verbose(*arg, **kwargs):  # pylint: disable=W0613
+            None                      # pylint: disable=pointless-statement
+    if platform_key.startswith("win"):
+        verbose(
+            f"PyTessy v{PyTessy.VERSION} on {platform_key} "
+            "searching for Tesseract-OCR library..."
+        )
+        if api_version is None:
+            lib_name = "libtesseract-5"
+        else:
+            lib_name = f"libtesseract{api_version}"
+        verbose(f"--- Target library name: {lib_name}")
+        if tesseract_path is not None:
+            dirs = [
+                tesseract_path,
+                run_path,
+                pathlib.Path(run_path, PyTessy.TESSERACT_DIRNAME),
+            ]
+        else:
+            dirs = [run_path, pathlib.Path(run_path, PyTessy.TESSERACT_DIRNAME)]
+        for program_dir in program_files:
+            if program_dir is not None:
+                dirs.append(pathlib.Path(program_dir, PyTessy.TESSERACT_DIRNAME))
+        for dir_ in dirs:
+            test = pathlib.Path(dir_, f"{lib_name}.dll")
+            if test.is_file():
+                verbose(f"    {test} SUCCESS.")
+                return test, None
+            verbose(f"    {test} FAILED.")
+        raise FileNotFoundError("Cannot locate Tesseract-OCR library.")
+    if platform_key.startswith("linux"):
+        if shutil.which("tesseract") is None:
+            raise FileNotFoundError("Cannot locate Tesseract-OCR library.")
+        return "tesseract", "/usr/share/tessdata/"
+    if platform_key.startswith("darwin"):
+        raise NotImplementedError(
+            "PyTessy: Library search on MacOS is not implemented yet."
+        )
+    raise NotImplementedError(
+        "PyTessy: Library search on this system is not implemented."
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _locate_tessdata(data_path, lib_path, run_path):
+    """
+    Searches for Tesseract-OCR data directory
+    -----------------------------------------
+    Results are cached like the ones of _locate_tesseract, a failed search
+    is not cached and runs again.
+    @Params: data_path  (string)    Path to data directory or None.
+             lib_path   (string)    Path to Tesseract-OCR library.
+             run_path   (string)    Directory to search in first.
+    @Return: (string)               Data path if it is an existing directory,
+                                    otherwise the first "tessdata" directory
+                                    found.
+    @Raises: FileNotFoundError      If the directory "tessdata" is not found.
+    """
+
+    if data_path is not None and pathlib.Path(data_path).is_dir():
+        return data_path
+    tess_path = pathlib.Path(lib_path).parent.absolute()
+    for test_path in [
+        run_path,
+        pathlib.Path(run_path, PyTessy.TESSERACT_DIRNAME),
+        tess_path,
+    ]:
+        test_path = pathlib.Path(test_path, PyTessy.TESSDATA_DIRNAME)
+        if test_path.is_dir():
+            return test_path
+    if data_path is None:
+        raise FileNotFoundError('PyTessy: Could not find "tessdata" directory.')
+    return data_path
+
+
 class PyTessy:
     """
     PyTessy
@@ -372,6 +589,7 @@ class PyTessy:
         oem=1,
         psm=7,
         char_whitelist=None,
+        shared_handler=False,
     ):
         """
         Initializes PyTessy instance
@@ -389,6 +607,16 @@ class PyTessy:
                  language       (string)    [optional] Language code to use.
                  verbose_search (boolean)   [optional] Whether to display
                                             library searching process or not.
+                 shared_handler (boolean)   [optional] Whether to reuse the
+                                            Tesseract-OCR instance of other
+                                            PyTessy objects created with the
+                                            same library, data path and
+                                            language. This skips loading the
+                                            language data again, but variables
+                                            (psm, char_whitelist, ...) are
+                                            shared too, and the objects must
+                                            not be used from several threads
+                                            at once.
         @Raises: NotImplementedError        If the operating system is not
                                             implemented yet (macOS).
                                             You can avoid this error by giving
@@ -414,87 +642,38 @@ class PyTessy:
                     f'PyTessy: lib_path: "{lib_path}" does not exist.'
                 )
         if no_lib:
+            # The cache would hide the search from verbose output
+            locate = _locate_tesseract
             if verbose_search:
-                def verbose(*arg, **kwargs):
-                    print(*arg, **kwargs)
-            else:
-                def verbose(*arg, **kwargs):  # pylint: disable=W0613
-                    None                      # pylint: disable=pointless-statement
-            if platform.startswith("win"):
-                verbose(
-                    f"PyTessy v{PyTessy.VERSION} on {platform} "
-                    "searching for Tesseract-OCR library..."
-                )
-                if api_version is None:
-                    lib_name = "libtesseract-5"
-                else:
-                    lib_name = f"libtesseract{api_version}"
-                verbose(f"--- Target library name: {lib_name}")
-                if tesseract_path is not None:
-                    dirs = [
-                        tesseract_path,
-                        run_path,
-                        pathlib.Path(run_path, PyTessy.TESSERACT_DIRNAME),
-                    ]
-                else:
-                    dirs = [run_path, pathlib.Path(run_path, PyTessy.TESSERACT_DIRNAME)]
-                if "PROGRAMFILES" in environ:
-                    dirs.append(
-                        pathlib.Path(environ["PROGRAMFILES"], PyTessy.TESSERACT_DIRNAME)
-                    )
-                if "PROGRAMFILES(X86)" in environ:
-                    dirs.append(
-                        pathlib.Path(
-                            environ["PROGRAMFILES(X86)"], PyTessy.TESSERACT_DIRNAME
-                        )
-                    )
-                for dir_ in dirs:
-                    test = pathlib.Path(dir_, f"{lib_name}.dll")
-                    if test.is_file():
-                        lib_path = test
-                        verbose(f"    {test} SUCCESS.")
-                        break
-                    verbose(f"    {test} FAILED.")
-                if lib_path is None:
-                    raise FileNotFoundError("Cannot locate Tesseract-OCR library.")
-            elif platform.startswith("linux"):
-                find_program = find_executable("tesseract")
-                if len(find_program) == 0:
-                    raise FileNotFoundError("Cannot locate Tesseract-OCR library.")
-                lib_path = "tesseract"
-                data_path = "/usr/share/tessdata/"
-            elif platform.startswith("darwin"):
-                raise NotImplementedError(
-                    "PyTessy: Library search on MacOS is not implemented yet."
-                )
-            else:
-                raise NotImplementedError(
-                    "PyTessy: Library search on this system is not implemented."
-                )
-        tess_path = pathlib.Path(lib_path).parent.absolute()
-        no_tessdata = True
-        if data_path is not None:
-            if pathlib.Path(data_path).is_dir():
-                no_tessdata = False
-        if no_tessdata:
-            for test_path in [
+                locate = _locate_tesseract.__wrapped__
+            lib_path, default_data_path = locate(
+                tesseract_path,
+                api_version,
                 run_path,
-                pathlib.Path(run_path, PyTessy.TESSERACT_DIRNAME),
-                tess_path,
-            ]:
-                test_path = pathlib.Path(test_path, PyTessy.TESSDATA_DIRNAME)
-                if test_path.is_dir():
-                    data_path = test_path
-                    break
+                platform,
+                (environ.get("PROGRAMFILES"), environ.get("PROGRAMFILES(X86)")),
+                verbose_search=verbose_search,
+            )
             if data_path is None:
-                raise FileNotFoundError('PyTessy: Could not find "tessdata" directory.')
-        self._tess = TesseractHandler(
-            lib_path=lib_path, data_path=data_path, language=language
-        )
-        self._tess.set_variable("tessedit_pageseg_mode", psm)
-        self._tess.set_variable("tessedit_ocr_engine_mode", oem)
+                data_path = default_data_path
+        data_path = _locate_tessdata(data_path, lib_path, run_path)
+        self._handler_args = {
+            "lib_path": lib_path,
+            "data_path": data_path,
+            "language": language,
+        }
+        self._variables = {}
+        self._shared_handler = shared_handler
+        if shared_handler:
+            self._tess = self._get_shared_handler(**self._handler_args)
+        else:
+            self._tess = TesseractHandler(**self._handler_args)
+        # Additional handlers for read_batch, created on first use
+        self._batch_handlers = [self._tess]
+        self.set_variable("tessedit_pageseg_mode", psm)
+        self.set_variable("tessedit_ocr_engine_mode", oem)
         if char_whitelist:
-            self._tess.set_variable("tessedit_char_whitelist", char_whitelist)
+            self.set_variable("tessedit_char_whitelist", char_whitelist)
 
     def justread(
         self,
@@ -509,7 +688,12 @@ class PyTessy:
         """
         Reads text as utf-8 string from raw image data without any check
         ----------------------------------------------------------------
-        @Params: raw_image_ctypes (ctypes int array)  Raw image data.
+        @Params: raw_image_ctypes (ctypes int array)  Raw image data as
+                                  (bytes)             ctypes array, bytes
+                                  (int)               object, int address or
+                                  (ctypes.c_void_p)   pointer (numpy ndarrays
+                                                      are read with read or
+                                                      readnp).
                  width            (int)               Image width.
                  height           (int)               Image height.
                  bytes_per_pixel  (int)               Number of bytes per pixel.
@@ -523,9 +707,6 @@ class PyTessy:
                                                       as utf-8 string.
         """
 
-        if psm is None:
-            psm = self.get_psm()
-
         self._tess.set_psm(psm)
         self._tess.set_image(
             raw_image_ctypes, width, height, bytes_per_pixel, bytes_per_line, resolution
@@ -545,7 +726,12 @@ class PyTessy:
         """
         Reads text as raw bytes data from raw image data without any check
         ------------------------------------------------------------------
-        @Params: raw_image_ctypes (ctypes int array)  Raw image data.
+        @Params: raw_image_ctypes (ctypes int array)  Raw image data as
+                                  (bytes)             ctypes array, bytes
+                                  (int)               object, int address or
+                                  (ctypes.c_void_p)   pointer (numpy ndarrays
+                                                      are read with read or
+                                                      readnp).
                  width            (int)               Image width.
                  height           (int)               Image height.
                  bytes_per_pixel  (int)               Number of bytes per pixel.
@@ -559,9 +745,6 @@ class PyTessy:
                                                       as raw bytes' data.
         """
 
-        if psm is None:
-            psm = self.get_psm()
-
         self._tess.set_psm(psm)
         self._tess.set_image(
             raw_image_ctypes, width, height, bytes_per_pixel, bytes_per_line, resolution
@@ -581,7 +764,12 @@ class PyTessy:
         """
         Reads text from image data
         --------------------------
-        @Params: imagedata        (ctypes int array)  Raw image data.
+        @Params: imagedata        (ctypes int array)  Raw image data, bytes
+                                  (bytes)             object, numpy ndarray,
+                                  (np.ndarray)        bytearray, memoryview,
+                                  (bytearray)         ctypes object or int
+                                  (memoryview)        address (passed without
+                                  (int)               copying).
                  width            (int)               Image width.
                  height           (int)               Image height.
                  bytes_per_pixel  (int)               Number of bytes per pixel.
@@ -595,9 +783,16 @@ class PyTessy:
         @Return: (bytes) or (string)                  Text read by Tesseract-OCR
         """
 
-        if psm is None:
-            psm = self.get_psm()
-
+        if not NO_NUMPY and isinstance(imagedata, (np.ndarray, bytearray, memoryview)):
+            # ctypes cannot convert these buffers itself, pass their address
+            # as a plain int; array keeps the (possibly copied) buffer alive
+            # during the read. Everything else (bytes, int, ctypes objects,
+            # objects with _as_parameter_, ...) is left to ctypes.
+            if isinstance(imagedata, np.ndarray):
+                array = np.ascontiguousarray(imagedata)
+            else:
+                array = np.frombuffer(imagedata, dtype=np.uint8)
+            imagedata = array.ctypes.data
         bytes_per_line = width * bytes_per_pixel
         if raw:
             return self.justread_raw(
@@ -638,22 +833,219 @@ class PyTessy:
                 "Function 'readnp' requires python module numpy, which is not available."
             )
             return ""
+        imagedata, width, height, bytes_per_pixel, bytes_per_line = (
+            self._ndarray_layout(imagedata)
+        )
+
+        # The buffer address is passed as a plain int, the ndarray stays
+        # referenced by imagedata until the read is over
+        justread = self.justread_raw if raw else self.justread
+        return justread(
+            imagedata.ctypes.data,
+            width,
+            height,
+            bytes_per_pixel,
+            bytes_per_line,
+            resolution,
+            psm,
+        )
+
+    def specialize(
+        self,
+        width,
+        height,
+        bytes_per_pixel,
+        *,
+        bytes_per_line=None,
+        resolution=96,
+        psm=None,
+        raw=False,
+    ):
+        """
+        Creates a reader for images of one fixed layout
+        -----------------------------------------------
+        The returned function takes the raw image data only, like justread
+        (bytes, int address or ctypes object; pass arr.ctypes.data for a
+        numpy ndarray). The other arguments are prepared once here.
+        The function stays bound to the current Tesseract-OCR instance: after
+        set_language on a shared_handler=True instance, create it again.
+        @Params: width            (int)       Image width.
+                 height           (int)       Image height.
+                 bytes_per_pixel  (int)       Number of bytes per pixel.
+                 bytes_per_line   (int)       [optional] Number of bytes per
+                                              line. Default: width *
+                                              bytes_per_pixel.
+                 resolution       (int)       [optional] Resolution in dpi.
+                                              Default: 96.
+                 psm              (int)       [optional] Page Segmentation
+                                              Mode as per TessPageSegMode
+                                              enum (see set_psm method)
+                 raw              (boolean)   [optional] Whether to read
+                                              in raw or utf-8 mode.
+        @Return: (function)                   Function reading raw image data
+                                              and returning the text as bytes
+                                              or string.
+        """
+        if bytes_per_line is None:
+            bytes_per_line = width * bytes_per_pixel
+        # Arguments are converted to C types once instead of on every call
+        handler = self._tess
+        api = handler._api  # pylint: disable=protected-access
+        set_image = handler._fn_set_image  # pylint: disable=protected-access
+        set_resolution = handler._fn_set_resolution  # pylint: disable=protected-access
+        get_text = handler.get_text_raw if raw else handler.get_text
+        width = ctypes.c_int(width)
+        height = ctypes.c_int(height)
+        bytes_per_pixel = ctypes.c_int(bytes_per_pixel)
+        bytes_per_line = ctypes.c_int(bytes_per_line)
+        resolution = ctypes.c_int(resolution)
+
+        def fast_read(raw_image_ctypes):
+            handler.set_psm(psm)
+            set_image(
+                api, raw_image_ctypes, width, height, bytes_per_pixel, bytes_per_line
+            )
+            set_resolution(api, resolution)
+            return get_text()
+
+        return fast_read
+
+    def read_pil(self, img, resolution=None, raw=False, psm=None):
+        """
+        Reads text from a PIL/Pillow image
+        ----------------------------------
+        Images in other modes than L, RGB or RGBA are converted to L first.
+        @Params: img         (PIL.Image)   Image to read.
+                 resolution  (int)         [optional] Resolution in dpi.
+                                           Default: resolution of the image
+                                           or 96 if it is unknown.
+                 raw         (boolean)     [optional] Whether to read
+                                           in raw or utf-8 mode.
+                 psm         (int)         [optional] Page Segmentation
+                                           Mode as per TessPageSegMode
+                                           enum (see set_psm method)
+        @Return: (bytes) or (string)       Text read by Tesseract-OCR
+        """
+        if NO_NUMPY:
+            print(
+                "Function 'read_pil' requires python module numpy, which is not available."
+            )
+            return ""
+        if img.mode not in ("L", "RGB", "RGBA"):
+            img = img.convert("L")
+        if resolution is None:
+            resolution = round(img.info.get("dpi", (PyTessy.DEFAULT_HORIZONTAL_DPI,))[0])
+        return self.readnp(np.asarray(img), resolution, raw, psm)
+
+    def read_batch(self, images, resolution=96, raw=False, psm=None, n_workers=None):
+        """
+        Reads text from several images in parallel
+        ------------------------------------------
+        Images are spread over worker threads, each one with its own
+        Tesseract-OCR instance. The instances are created on first use, get
+        the same variables as this one and are reused by later calls.
+        @Params: images      (iterable)    numpy ndarrays, see readnp.
+                 resolution  (int)         [optional] Resolution in dpi.
+                                           Default: 96.
+                 raw         (boolean)     [optional] Whether to read
+                                           in raw or utf-8 mode.
+                 psm         (int)         [optional] Page Segmentation
+                                           Mode as per TessPageSegMode
+                                           enum (see set_psm method)
+                 n_workers   (int)         [optional] Number of parallel
+                                           Tesseract-OCR instances.
+                                           Default: number of CPUs.
+        @Return: (list)                    Texts read by Tesseract-OCR, in
+                                           the order of the images.
+        """
+        if NO_NUMPY:
+            print(
+                "Function 'read_batch' requires python module numpy, "
+                "which is not available."
+            )
+            return []
+        images = [self._ndarray_layout(imagedata) for imagedata in images]
+        if not images:
+            return []
+        n_workers = min(n_workers or cpu_count() or 1, len(images))
+        while len(self._batch_handlers) < n_workers:
+            handler = TesseractHandler(**self._handler_args)
+            for key, val in self._variables.items():
+                handler.set_variable(key, val)
+            self._batch_handlers.append(handler)
+        if psm is None:
+            psm = self.get_psm()
+
+        def work(index):
+            handler = self._batch_handlers[index]
+            handler.set_psm(psm)
+            texts = []
+            for imagedata, *layout in images[index::n_workers]:
+                handler.set_image(imagedata.ctypes.data, *layout, resolution)
+                texts.append(handler.get_text_raw() if raw else handler.get_text())
+            return texts
+
+        results = [None] * len(images)
+        with ThreadPoolExecutor(n_workers) as executor:
+            for index, texts in enumerate(executor.map(work, range(n_workers))):
+                results[index::n_workers] = texts
+        return results
+
+    @staticmethod
+    def _get_shared_handler(lib_path, data_path, language):
+        """
+        Gets Tesseract-OCR handler shared by PyTessy instances
+        ------------------------------------------------------
+        @Params: lib_path   (string)    Path to Tesseract-OCR library.
+                 data_path  (string)    Path to Tesseract-OCR data files.
+                 language   (string)    Language code to work with.
+        @Return: (TesseractHandler)     Handler from the cache, created if
+                                        there is none with these arguments.
+        """
+        key = (str(lib_path), str(data_path), language)
+        with _HANDLER_CACHE_LOCK:
+            handler = _HANDLER_CACHE.get(key)
+            if handler is None:
+                handler = TesseractHandler(lib_path, data_path, language)
+                _HANDLER_CACHE[key] = handler
+        return handler
+
+    @staticmethod
+    def _ndarray_layout(imagedata):
+        """
+        Checks image data in a numpy ndarray and gets its layout
+        --------------------------------------------------------
+        @Params: imagedata   (np.ndarray)  Raw image data in a numpy ndarray.
+        @Return: (tuple)                   Image data with contiguous pixels
+                                           in each row, width, height, bytes
+                                           per pixel and bytes per line.
+        @Raises: PyTessyError              If imagedata is not a 3- or 2-
+                                           dimensional numpy ndarray.
+                 PyTessyError              If imagedata is not of uint8
+                                           data type.
+        """
         if not isinstance(imagedata, np.ndarray):
             raise PyTessyError("imagedata should be 3- or 2- dimensional numpy ndarray")
-        if len(imagedata.shape) == 2:  # greyscale picture
+        if imagedata.dtype != np.uint8:
+            # Tesseract-OCR reads 8 bits per channel only
+            raise PyTessyError(
+                f"imagedata should be of uint8 data type, not {imagedata.dtype}"
+            )
+        if imagedata.ndim == 2:  # greyscale picture
             height, width = imagedata.shape
             bytes_per_pixel = 1
-        elif len(imagedata.shape) == 3:  # 24 or 32 bits color picture
+        elif imagedata.ndim == 3:  # 24 or 32 bits color picture
             height, width, bytes_per_pixel = imagedata.shape
         else:
             raise PyTessyError("imagedata should be 3- or 2- dimensional numpy ndarray")
-
-        if psm is None:
-            psm = self.get_psm()
-
-        return self.read(
-            imagedata.ctypes, width, height, bytes_per_pixel, resolution, raw, psm
-        )
+        # Rows may be apart (e.g. a crop of a wider image) as long as the
+        # pixels of a row are contiguous, other layouts need a copy
+        row_stride, *pixel_strides = imagedata.strides
+        contiguous_pixels = [bytes_per_pixel, 1] if imagedata.ndim == 3 else [1]
+        if pixel_strides != contiguous_pixels or row_stride < width * bytes_per_pixel:
+            imagedata = np.ascontiguousarray(imagedata)
+            row_stride = width * bytes_per_pixel
+        return imagedata, width, height, bytes_per_pixel, row_stride
 
     def set_psm(self, psm):
         """
@@ -684,8 +1076,59 @@ class PyTessy:
                  val (str) Variable value
         @Return: (bool) ``False`` if the name lookup failed.
         """
+        self._variables[key] = val
+        for handler in self._batch_handlers[1:]:
+            handler.set_variable(key, val)
         return self._tess.set_variable(key, val)
 
+    def set_language(self, language):
+        """
+        Switches to another language
+        ----------------------------
+        The Tesseract-OCR instances (also the ones of read_batch) are
+        initialized again with the new language instead of being recreated.
+        Variables set before (char_whitelist, ...) and the current psm are
+        set again. If the new language fails to load, the old one is kept.
+        @Params: language (str) Language code to use.
+        @Raises: PyTessyError   If Tesseract-OCR fails to load the language
+                                data.
+        """
+        old_language = self._handler_args["language"]
+        psm = self.get_psm()
+        try:
+            self._init_language(language, psm)
+        except PyTessyError:
+            # A failed init leaves Tesseract-OCR unusable, restore the old one
+            self._init_language(old_language, psm)
+            raise
+
+    def _init_language(self, language, psm):
+        """
+        Initializes Tesseract-OCR instances with a language
+        ---------------------------------------------------
+        @Params: language (str) Language code to use.
+                 psm      (int) Page Segmentation Mode to set afterwards.
+        @Raises: PyTessyError   If Tesseract-OCR fails to load the language
+                                data.
+        """
+        data_path = self._handler_args["data_path"]
+        if self._shared_handler:
+            # Other instances may still use the old language
+            self._tess = self._get_shared_handler(
+                self._handler_args["lib_path"], data_path, language
+            )
+            handlers = self._batch_handlers[1:]
+            self._batch_handlers[0] = self._tess
+        else:
+            handlers = self._batch_handlers
+        for handler in handlers:
+            handler.reinit(data_path, language)
+        self._handler_args["language"] = language
+        for handler in self._batch_handlers:
+            for key, val in self._variables.items():
+                handler.set_variable(key, val)
+            handler.set_psm(psm)
+
     def mean_text_conf(self):
         """
         @Return: (int) average confidence value between 0 and 100.
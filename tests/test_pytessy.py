@@ -1,11 +1,13 @@
 """
    These are the unit tests for our pytessy
 """
+import ctypes
 import unittest
 import pathlib
 
+import numpy as np
 from PIL import Image
-from pytessy.pytessy import PyTessy
+from pytessy.pytessy import PyTessy, PyTessyError
 
 try:
     import cv2
@@ -37,6 +39,131 @@ class TestPyTessy(unittest.TestCase):
         )
         self.assertEqual(image_str, b"Test Word\n")
 
+    def test_pytessy_read_ndarray(self):
+        """Test read function with numpy ndarray as image data"""
+        ocr_reader = PyTessy()
+        img = np.asarray(Image.open(self._image_file))
+        height, width, bytes_per_pixel = img.shape
+        image_str = ocr_reader.read(
+            img, width, height, bytes_per_pixel, raw=True, resolution=300
+        )
+        self.assertEqual(image_str, b"Test Word\n")
+
+    def test_pytessy_read_buffer(self):
+        """Test read function with bytearray and int address as image data"""
+        ocr_reader = PyTessy()
+        img = Image.open(self._image_file)
+        bytes_per_pixel = len(img.getbands())
+        img_bytes = bytearray(img.tobytes())
+        image_str = ocr_reader.read(
+            img_bytes, img.width, img.height, bytes_per_pixel, resolution=300
+        )
+        self.assertEqual(image_str, "Test Word\n")
+        array = np.frombuffer(img_bytes, dtype=np.uint8)
+        image_str = ocr_reader.read(
+            array.ctypes.data, img.width, img.height, bytes_per_pixel, resolution=300
+        )
+        self.assertEqual(image_str, "Test Word\n")
+
+    def test_pytessy_read_ctypes(self):
+        """Test read function with ctypes objects as image data"""
+        ocr_reader = PyTessy()
+        img = Image.open(self._image_file)
+        bytes_per_pixel = len(img.getbands())
+        array = np.frombuffer(img.tobytes(), dtype=np.uint8)
+        for imagedata in (
+            array.ctypes,
+            array.ctypes.data_as(ctypes.POINTER(ctypes.c_ubyte)),
+        ):
+            image_str = ocr_reader.read(
+                imagedata, img.width, img.height, bytes_per_pixel, resolution=300
+            )
+            self.assertEqual(image_str, "Test Word\n")
+
+    def test_pytessy_readnp_crop(self):
+        """Test readnp function with a crop of a wider image"""
+        ocr_reader = PyTessy()
+        img = np.asarray(Image.open(self._image_file).convert("L"))
+        height, width = img.shape
+        wide = np.full((height, width + 50), 255, dtype=np.uint8)
+        wide[:, :width] = img
+        image_str = ocr_reader.readnp(wide[:, :width], resolution=300, psm=7)
+        self.assertEqual(image_str, "Test Word\n")
+
+    def test_pytessy_specialize(self):
+        """Test reader specialized for a fixed image layout"""
+        ocr_reader = PyTessy()
+        img = Image.open(self._image_file)
+        fast_read = ocr_reader.specialize(
+            img.width, img.height, len(img.getbands()), resolution=300, psm=7
+        )
+        img_bytes = img.tobytes()
+        self.assertEqual(fast_read(img_bytes), "Test Word\n")
+        self.assertEqual(fast_read(img_bytes), "Test Word\n")
+
+    def test_pytessy_readnp_dtype(self):
+        """Test readnp function rejects other data types than uint8"""
+        ocr_reader = PyTessy()
+        img = np.asarray(Image.open(self._image_file).convert("L"))
+        for dtype in (np.uint16, np.float32):
+            with self.assertRaises(PyTessyError):
+                ocr_reader.readnp(img.astype(dtype))
+
+    def test_pytessy_read_pil(self):
+        """Test read_pil function with PIL/Pillow image"""
+        ocr_reader = PyTessy()
+        img = Image.open(self._image_file)
+        self.assertEqual(ocr_reader.read_pil(img, resolution=300), "Test Word\n")
+        self.assertEqual(
+            ocr_reader.read_pil(img.convert("1"), resolution=300), "Test Word\n"
+        )
+
+    def test_pytessy_read_batch(self):
+        """Test reading several images in parallel"""
+        ocr_reader = PyTessy()
+        img = np.asarray(Image.open(self._image_file).convert("L"))
+        image_strs = ocr_reader.read_batch([img] * 3, resolution=300, n_workers=2)
+        self.assertEqual(image_strs, ["Test Word\n"] * 3)
+
+    def test_pytessy_shared_handler(self):
+        """Test sharing Tesseract-OCR instance between PyTessy objects"""
+        # pylint: disable=protected-access
+        ocr_reader = PyTessy(shared_handler=True)
+        self.assertIs(PyTessy(shared_handler=True)._tess, ocr_reader._tess)
+        self.assertIsNot(PyTessy()._tess, ocr_reader._tess)
+
+    def test_pytessy_set_language(self):
+        """Test switching language of an existing instance"""
+        ocr_reader = PyTessy(psm=7)
+        ocr_reader.set_language("eng")
+        self.assertEqual(ocr_reader.get_psm(), 7)
+        img = Image.open(self._image_file)
+        self.assertEqual(ocr_reader.read_pil(img, resolution=300), "Test Word\n")
+        ocr_reader.set_psm(8)
+        ocr_reader.set_language("eng")
+        self.assertEqual(ocr_reader.get_psm(), 8)
+        with self.assertRaises(PyTessyError):
+            ocr_reader.set_language("no-such-language")
+        # The old language is still usable
+        self.assertEqual(ocr_reader.get_psm(), 8)
+        self.assertEqual(
+            ocr_reader.read_pil(img, resolution=300, psm=7), "Test Word\n"
+        )
+
+    def test_pytessy_get_languages(self):
+        """Test listing available languages"""
+        ocr_reader = PyTessy()
+        self.assertIn("eng", ocr_reader.get_languages())
+
+    def test_pytessy_psm(self):
+        """Test page segmentation mode set by method or by variable"""
+        ocr_reader = PyTessy(psm=7)
+        self.assertEqual(ocr_reader.get_psm(), 7)
+        ocr_reader.set_psm(8)
+        self.assertEqual(ocr_reader.get_psm(), 8)
+        ocr_reader.set_variable("tessedit_pageseg_mode", 6)
+        self.assertEqual(ocr_reader.get_psm(), 6)
+
     if CV2_EXISTS:
 
         def test_pytessy_readnp(self):